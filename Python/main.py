@@ -6,13 +6,18 @@ import sqlite3
 import re
 import hashlib
 import random
+import secrets
 import string
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Tuple
 import asyncio
+import atexit
+import threading
+import time
 from collections import defaultdict, deque
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ChatMember
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
+from telegram.request import HTTPXRequest
 from telegram.error import TelegramError
 
 # Enable logging
@@ -24,6 +29,21 @@ logger = logging.getLogger(__name__)
 # Global application variable
 application = None
 
+# datetime.now().date() costs a syscall plus localtime conversion on every
+# call, but the value only changes at midnight - cache it for up to a minute.
+_today_cache = (0.0, None)
+
+def _today():
+    """Return today's date, recomputed at most once a minute"""
+    global _today_cache
+    ts, value = _today_cache
+    now = time.monotonic()
+    if value is None or now - ts >= 60.0:
+        value = datetime.now().date()
+        _today_cache = (now, value)
+    return value
+
+
 class ModerationSystem:
     def __init__(self):
         # Anti-spam settings
@@ -33,9 +53,12 @@ class ModerationSystem:
             'same_message_limit': 3
         }
         
-        # User tracking
+        # User tracking. Timestamp deques hold time.monotonic() floats in
+        # chronological order; text deques hold (timestamp, body) pairs for
+        # the repeated-message check, trimmed to the same 60s window.
         self.user_messages = defaultdict(lambda: deque(maxlen=50))
-        self.user_commands = defaultdict(lambda: deque(maxlen=20))
+        self.user_texts = defaultdict(lambda: deque(maxlen=10))
+        self.command_buckets = {}  # user_id -> [tokens, last_refill]
         self.user_warnings = defaultdict(int)
         self.muted_users = set()
         self.banned_users = set()
@@ -54,8 +77,37 @@ class ModerationSystem:
             'raid': ['raid', 'spam', 'flood', 'attack', 'mass message']
         }
         
-        # Admin user IDs (set these for your admins)
+        # One precompiled scanner for every keyword: a single alternation
+        # runs over the text in one pass, with one named group per
+        # category so lastgroup reveals which category matched.
+        self._spam_keyword_re = re.compile(
+            "|".join(
+                "(?P<%s>%s)" % (category, "|".join(re.escape(k) for k in keywords))
+                for category, keywords in self.spam_keywords.items()
+            ),
+            re.IGNORECASE,
+        )
+        # Messages shorter than the shortest keyword can't match at all -
+        # lets typical "ok"/"yes"/emoji chatter skip the scan entirely.
+        self._min_keyword_len = min(
+            len(keyword)
+            for keywords in self.spam_keywords.values()
+            for keyword in keywords
+        )
+        
+        # Admin user IDs (set these for your admins). is_admin runs on
+        # every message, so it checks a frozenset snapshot rebuilt on the
+        # rare add_admin writes.
         self.admin_ids = set()
+        self._admin_frozen = frozenset()
+        
+        # Every possible math CAPTCHA, built once; generate_captcha just
+        # picks an entry instead of running the RNG twice per new user.
+        self._captcha_table = [
+            (f"What is {a} + {b}?", a + b)
+            for a in range(1, 11)
+            for b in range(1, 11)
+        ]
         
         # Suspicious patterns
         self.suspicious_patterns = [
@@ -64,71 +116,88 @@ class ModerationSystem:
             r'@[a-zA-Z0-9_]{5,}',  # Username mentions
             r'\b\d{10,}\b'  # Long numbers (phone numbers, etc.)
         ]
+        # All patterns compiled into one alternation so each message gets
+        # a single scan instead of one re.search per pattern.
+        self._suspicious_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.suspicious_patterns)
+        )
+        # Shortest text any pattern can match ('@' plus five name chars)
+        self._min_suspicious_len = 6
     
     def add_admin(self, user_id: int):
         """Add admin user"""
         self.admin_ids.add(user_id)
+        self._admin_frozen = frozenset(self.admin_ids)
     
     def is_admin(self, user_id: int) -> bool:
         """Check if user is admin"""
-        return user_id in self.admin_ids
+        return user_id in self._admin_frozen
     
     def is_flood_spam(self, user_id: int, message_text: str) -> bool:
         """Check for flood/spam behavior"""
-        now = datetime.now()
+        now = time.monotonic()
+        cutoff = now - 60.0
         
-        # Check message frequency
+        # Check message frequency: the deque is chronological, so expired
+        # entries trim off the left instead of rescanning the window
         user_msgs = self.user_messages[user_id]
         user_msgs.append(now)
-        
-        # Count messages in last minute
-        recent_msgs = [msg for msg in user_msgs if (now - msg).seconds < 60]
-        if len(recent_msgs) > self.flood_limits['messages_per_minute']:
+        while user_msgs and user_msgs[0] < cutoff:
+            user_msgs.popleft()
+        if len(user_msgs) > self.flood_limits['messages_per_minute']:
             return True
         
-        # Check for repeated messages
-        recent_text_list = list(user_msgs)[-10:]
-        same_count = sum(1 for msg_time in recent_text_list if str(msg_time) == message_text)
+        # Check for repeated messages within the same window - like the
+        # per-minute limits, identical texts only count as flooding when
+        # they come in quick succession. Captionless media arrives as an
+        # empty string and has no text to repeat, so it stays out of the
+        # deque entirely.
+        if not message_text:
+            return False
+        user_texts = self.user_texts[user_id]
+        user_texts.append((now, message_text))
+        while user_texts and user_texts[0][0] < cutoff:
+            user_texts.popleft()
+        same_count = sum(1 for _, text in user_texts if text == message_text)
         if same_count >= self.flood_limits['same_message_limit']:
             return True
         
         return False
     
     def is_command_spam(self, user_id: int) -> bool:
-        """Check for command spam"""
-        now = datetime.now()
-        user_cmds = self.user_commands[user_id]
-        user_cmds.append(now)
-        
-        # Count commands in last minute
-        recent_cmds = [cmd for cmd in user_cmds if (now - cmd).seconds < 60]
-        return len(recent_cmds) > self.flood_limits['commands_per_minute']
+        """Check for command spam with a per-user token bucket"""
+        capacity = self.flood_limits['commands_per_minute']
+        now = time.monotonic()
+        bucket = self.command_buckets.get(user_id)
+        if bucket is None:
+            bucket = self.command_buckets[user_id] = [float(capacity), now]
+        # Refill at capacity-per-minute, then spend one token per command
+        tokens = min(float(capacity), bucket[0] + (now - bucket[1]) * (capacity / 60.0))
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            return True
+        bucket[0] = tokens - 1.0
+        return False
     
     def contains_spam_keywords(self, text: str) -> Tuple[bool, str]:
         """Check if text contains spam keywords"""
-        text_lower = text.lower()
-        
-        for category, keywords in self.spam_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return True, category
-        
+        if len(text) < self._min_keyword_len:
+            return False, ""
+        match = self._spam_keyword_re.search(text)
+        if match:
+            return True, match.lastgroup
         return False, ""
     
     def is_suspicious_pattern(self, text: str) -> bool:
         """Check for suspicious patterns"""
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, text):
-                return True
-        return False
+        if len(text) < self._min_suspicious_len:
+            return False
+        return self._suspicious_re.search(text) is not None
     
-    def generate_captcha(self) -> Tuple[str, str]:
-        """Generate simple math CAPTCHA"""
-        num1 = random.randint(1, 10)
-        num2 = random.randint(1, 10)
-        question = f"What is {num1} + {num2}?"
-        answer = str(num1 + num2)
-        return question, answer
+    def generate_captcha(self) -> Tuple[str, int]:
+        """Pick a simple math CAPTCHA from the precomputed table"""
+        return random.choice(self._captcha_table)
     
     def add_warning(self, user_id: int) -> int:
         """Add warning to user and return warning count"""
@@ -155,228 +224,494 @@ class ModerationSystem:
         """Check if user is banned"""
         return user_id in self.banned_users
 
+# Static response texts, built once at import instead of per update and
+# stripped of the surrounding blank lines the old inline literals sent
+# over the wire. WELCOME_TEMPLATE is the only one with a placeholder;
+# handlers fill it with a single .format call.
+WELCOME_TEMPLATE = """
+🚀 Welcome to HustleBot, {name}! 
+
+💪 Your journey to success starts here!
+
+🔥 Available Commands:
+/points - Check your hustle points
+/leaderboard - See top hustlers
+/daily - Complete daily tasks
+/submit_meme - Submit a meme for points
+/help - Show all commands
+
+Let's start hustling! 💯
+    """.strip()
+
+HELP_TEXT = """
+🤖 HustleBot Commands:
+
+🎯 Basic Commands:
+/start - Start your hustle journey
+/points - Check your hustle points
+/leaderboard - Top 10 hustlers
+/daily - View daily tasks
+/submit_meme - Submit meme for points
+
+💡 How to earn points:
+• Complete daily tasks (+100 points)
+• Submit memes (+50 points)
+• Maintain daily streaks (bonus points)
+• Engage with the community
+
+🔥 Keep hustling every day to climb the leaderboard!
+    """.strip()
+
+DAILY_TASKS_TEXT = """
+📋 DAILY HUSTLE TASKS
+
+Complete these tasks to earn points:
+
+🎯 Share Your Goal (+100 points)
+💪 Workout Update (+100 points)  
+📚 Learning Progress (+100 points)
+🧠 Motivational Quote (+50 points)
+💼 Business Update (+150 points)
+
+Click buttons below to complete tasks!
+    """.strip()
+
+MEME_INSTRUCTIONS_TEXT = """
+🎭 MEME SUBMISSION
+
+📸 Send me a photo or GIF to submit a meme!
+✨ Add a caption to make it funnier
+🏆 Earn 50 hustle points per meme
+💎 Best memes get bonus points!
+
+Just send your meme now! 📱
+    """.strip()
+
+MEME_SUCCESS_TEXT = """
+🎉 MEME SUBMITTED!
+
++50 Hustle Points earned! 💎
+Your meme has been added to the collection!
+
+Keep the memes coming! 🔥
+        """.strip()
+
+
+# Static keyboards, built once at import. They are immutable, so sharing
+# one instance across handlers is safe and avoids rebuilding the nested
+# button lists on every update.
+START_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💎 Check Points", callback_data="check_points")],
+    [InlineKeyboardButton("🏆 Leaderboard", callback_data="leaderboard")],
+    [InlineKeyboardButton("📋 Daily Tasks", callback_data="daily_tasks")]
+])
+
+LEADERBOARD_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💎 My Points", callback_data="check_points")],
+    [InlineKeyboardButton("📋 Daily Tasks", callback_data="daily_tasks")]
+])
+
+DAILY_TASKS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🎯 Goal Shared", callback_data="task_goal")],
+    [InlineKeyboardButton("💪 Workout Done", callback_data="task_workout")],
+    [InlineKeyboardButton("📚 Learning", callback_data="task_learning")],
+    [InlineKeyboardButton("🧠 Quote", callback_data="task_quote")],
+    [InlineKeyboardButton("💼 Business", callback_data="task_business")]
+])
+
+MEME_SUCCESS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💎 Check Points", callback_data="check_points")],
+    [InlineKeyboardButton("🏆 Leaderboard", callback_data="leaderboard")]
+])
+
+# Points awarded per daily task, shared by the task callbacks.
+TASK_POINTS = {"goal": 100, "workout": 100, "learning": 100, "quote": 50, "business": 150}
+
+MINI_DAILY_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🎯 Goal (+100)", callback_data="task_goal")],
+    [InlineKeyboardButton("💪 Workout (+100)", callback_data="task_workout")],
+    [InlineKeyboardButton("📚 Learning (+100)", callback_data="task_learning")]
+])
+
+
+# SQL for HustleBot's hot paths, kept as module constants so sqlite3's
+# per-connection statement cache reuses the prepared form instead of
+# re-parsing the text on every call.
+_SQL_USER_EXISTS = "SELECT 1 FROM users WHERE user_id = ?"
+_SQL_USER_STATS = """
+    SELECT hustle_points, daily_streak, last_activity, substr(join_date, 1, 10) AS join_date
+    FROM users
+    WHERE user_id = ?
+"""
+_SQL_INSERT_USER = """
+    INSERT INTO users (user_id, username, first_name, hustle_points, daily_streak, last_activity)
+    VALUES (?, ?, ?, 0, 0, ?)
+"""
+_SQL_USER_STATS_BRIEF = "SELECT hustle_points, daily_streak FROM users WHERE user_id = ?"
+_SQL_LEADERBOARD = """
+    SELECT COALESCE(NULLIF(username, ''), first_name) AS display_name,
+           hustle_points, daily_streak
+    FROM users
+    ORDER BY hustle_points DESC
+    LIMIT ?
+"""
+_SQL_INSERT_TASK = """
+    INSERT OR IGNORE INTO daily_tasks (user_id, task_type, completed_date, points_earned)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_TASK_REWARD = """
+    UPDATE users SET
+        hustle_points = hustle_points + ?,
+        daily_streak = daily_streak + 1,
+        last_activity = ?
+    WHERE user_id = ?
+"""
+_SQL_INSERT_MEME = """
+    INSERT INTO memes (user_id, file_id, caption)
+    VALUES (?, ?, ?)
+"""
+_SQL_MEME_REWARD = """
+    UPDATE users SET hustle_points = hustle_points + 50, last_activity = ?
+    WHERE user_id = ?
+"""
+_SQL_LOG_ACTION = """
+    INSERT INTO moderation_logs (user_id, action, reason, admin_id)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_SET_VERIFIED = """
+    INSERT OR REPLACE INTO user_verification (user_id, is_verified, verification_date)
+    VALUES (?, ?, ?)
+"""
+_SQL_IS_VERIFIED = "SELECT is_verified FROM user_verification WHERE user_id = ?"
+
+# Full schema, applied in one executescript pass when the database is new
+# (see _apply_schema / _SCHEMA_VERSION).
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        username TEXT,
+        first_name TEXT,
+        hustle_points INTEGER DEFAULT 0,
+        daily_streak INTEGER DEFAULT 0,
+        last_activity DATE,
+        join_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS daily_tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        task_type TEXT,
+        completed_date DATE,
+        points_earned INTEGER,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS memes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        file_id TEXT,
+        caption TEXT,
+        votes INTEGER DEFAULT 0,
+        submission_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS moderation_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        action TEXT,
+        reason TEXT,
+        admin_id INTEGER,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS user_verification (
+        user_id INTEGER PRIMARY KEY,
+        is_verified BOOLEAN DEFAULT FALSE,
+        verification_date TIMESTAMP,
+        captcha_attempts INTEGER DEFAULT 0
+    );
+
+    -- Indexes for the hot queries: leaderboard ORDER BY and the per-user
+    -- daily task lookup. The unique index also guarantees a task can only
+    -- be completed once per day at the DB level.
+    CREATE INDEX IF NOT EXISTS idx_users_points
+        ON users(hustle_points DESC);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_daily_tasks_uniq
+        ON daily_tasks(user_id, task_type, completed_date);
+"""
+
+
+# Members past this point total skip the per-message moderation scans
+TRUSTED_POINTS_THRESHOLD = 1000
+
+# Bumped whenever _apply_schema's DDL changes; stored in PRAGMA user_version
+# so warm starts skip the schema statements entirely.
+_SCHEMA_VERSION = 1
+
+
 class HustleBot:
     def __init__(self):
         self.db_path = "hustle_bot.db"
         self.moderation = ModerationSystem()
+        # Single long-lived connection shared by all methods; opening a fresh
+        # connection per query costs more than the queries themselves.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # Write-behind buffer for moderation logs: nothing reads them back,
+        # so rows queue up and flush as one executemany transaction once
+        # the batch or the deadline fills - a single fsync per burst of
+        # moderation events.
+        self._modlog_buf = []  # parameter rows for _SQL_LOG_ACTION
+        self._modlog_flush_at = 0.0
+        self._modlog_max_delay = 0.1
+        self._modlog_max_batch = 500
+        atexit.register(self.close)
+        # The leaderboard is the most-hammered query but changes slowly;
+        # cache results per limit for a short window and drop the cache
+        # whenever points change.
+        self._leaderboard_cache = {}  # limit -> (monotonic timestamp, rows)
+        self._leaderboard_ttl = 30.0
+        # Per-user stats rows; every mutating path evicts the affected user,
+        # so entries never go stale within this process.
+        self._stats_cache = {}  # user_id -> stats row
+        # Verification rarely changes but is checked on every moderated
+        # message; cache it and update the entry on writes.
+        self._verified_cache = {}  # user_id -> bool
         self.init_database()
-        
-    def init_database(self):
-        """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                username TEXT,
-                first_name TEXT,
-                hustle_points INTEGER DEFAULT 0,
-                daily_streak INTEGER DEFAULT 0,
-                last_activity DATE,
-                join_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Daily tasks table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS daily_tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                task_type TEXT,
-                completed_date DATE,
-                points_earned INTEGER,
-                FOREIGN KEY (user_id) REFERENCES users (user_id)
-            )
-        ''')
-        
-        # Memes table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS memes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                file_id TEXT,
-                caption TEXT,
-                votes INTEGER DEFAULT 0,
-                submission_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (user_id)
-            )
-        ''')
-        
-        # Moderation tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS moderation_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                action TEXT,
-                reason TEXT,
-                admin_id INTEGER,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_verification (
-                user_id INTEGER PRIMARY KEY,
-                is_verified BOOLEAN DEFAULT FALSE,
-                verification_date TIMESTAMP,
-                captcha_attempts INTEGER DEFAULT 0
+        # Users already seen this process (seeded from the DB) - lets
+        # get_or_create_user skip SQLite entirely after the first sighting.
+        self._known_users = {row[0] for row in self._conn.execute("SELECT user_id FROM users")}
+        # Long-standing members are exempt from moderation scans; seeded
+        # here and promoted as users cross the threshold.
+        self.trusted_users = {
+            row[0]
+            for row in self._conn.execute(
+                "SELECT user_id FROM users WHERE hustle_points >= ?",
+                (TRUSTED_POINTS_THRESHOLD,),
             )
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
+        }
+
+    def close(self):
+        """Flush buffered writes and close the shared connection (idempotent)"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_modlog_locked()
+            self._conn.close()
+            self._conn = None
+
+    def init_database(self):
+        """Initialize SQLite database: tuning pragmas plus one-time schema"""
+        self._apply_pragmas()
+        self._apply_schema()
+
+    def _apply_pragmas(self):
+        """Tune SQLite for the bot's write-heavy workload.
+
+        WAL lets readers run during commits, NORMAL halves fsync cost, and
+        the rest keep temp data and hot pages in memory. journal_mode
+        persists in the database file; the others are per-connection and
+        reapplied on every startup.
+        """
+        cursor = self._conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA busy_timeout=5000")
+
+    def _apply_schema(self):
+        """Create tables and indexes, skipped entirely on warm starts"""
+        cursor = self._conn.cursor()
+
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+
+        # One executescript call: a single parse pass and one implicit
+        # transaction for all of the DDL.
+        cursor.executescript(_SCHEMA_SQL)
+
+        cursor.execute("PRAGMA user_version = %d" % _SCHEMA_VERSION)
+        self._conn.commit()
+
     def get_or_create_user(self, user_id: int, username: str = None, first_name: str = None):
-        """Get user from database or create new one"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        user = cursor.fetchone()
-        
-        if not user:
-            cursor.execute('''
-                INSERT INTO users (user_id, username, first_name, hustle_points, daily_streak, last_activity)
-                VALUES (?, ?, ?, 0, 0, ?)
-            ''', (user_id, username, first_name, datetime.now().date()))
-            conn.commit()
-            
-        conn.close()
-        return user
-    
-    def add_hustle_points(self, user_id: int, points: int):
-        """Add hustle points to user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE users SET hustle_points = hustle_points + ?, last_activity = ?
-            WHERE user_id = ?
-        ''', (points, datetime.now().date(), user_id))
-        
-        conn.commit()
-        conn.close()
-    
+        """Ensure the user exists in the database"""
+        if user_id in self._known_users:
+            return
+
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute(_SQL_USER_EXISTS, (user_id,))
+            user = cursor.fetchone()
+
+            if not user:
+                cursor.execute(_SQL_INSERT_USER, (user_id, username, first_name, _today()))
+                self._conn.commit()
+
+        self._known_users.add(user_id)
+
+    def upsert_and_get_stats(self, user_id: int, username: str = None, first_name: str = None):
+        """Ensure the user exists and return their stats in one DB visit"""
+        self.get_or_create_user(user_id, username, first_name)
+        return self.get_user_stats(user_id)
+
+    def _flush_modlog_locked(self):
+        """Write queued moderation log rows in one transaction (lock held)"""
+        if not self._modlog_buf:
+            return
+        cursor = self._conn.cursor()
+        cursor.executemany(_SQL_LOG_ACTION, self._modlog_buf)
+        self._modlog_buf.clear()
+        self._conn.commit()
+
+    def flush_modlog(self):
+        """Flush any queued moderation log rows to the database"""
+        with self._lock:
+            self._flush_modlog_locked()
+
     def get_user_stats(self, user_id: int):
         """Get user statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        user = cursor.fetchone()
-        
-        conn.close()
-        return user
-    
+        cached = self._stats_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute(_SQL_USER_STATS, (user_id,))
+            row = cursor.fetchone()
+
+        if row is not None:
+            self._stats_cache[user_id] = row
+            if row["hustle_points"] >= TRUSTED_POINTS_THRESHOLD:
+                self.trusted_users.add(user_id)
+        return row
+
+    def get_user_stats_brief(self, user_id: int):
+        """Points and streak only - enough for the callback fast path"""
+        cached = self._stats_cache.get(user_id)
+        if cached is not None:
+            return cached  # the full row also carries the brief columns
+
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute(_SQL_USER_STATS_BRIEF, (user_id,))
+            return cursor.fetchone()
+
     def get_leaderboard(self, limit: int = 10):
         """Get top users by hustle points"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT user_id, username, first_name, hustle_points, daily_streak
-            FROM users 
-            ORDER BY hustle_points DESC 
-            LIMIT ?
-        ''', (limit,))
-        
-        leaderboard = cursor.fetchall()
-        conn.close()
-        return leaderboard
-    
+        cached = self._leaderboard_cache.get(limit)
+        if cached and time.monotonic() - cached[0] < self._leaderboard_ttl:
+            return cached[1]
+
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute(_SQL_LEADERBOARD, (limit,))
+
+            rows = cursor.fetchall()
+
+        self._leaderboard_cache[limit] = (time.monotonic(), rows)
+        return rows
+
     def complete_daily_task(self, user_id: int, task_type: str, points: int):
         """Mark daily task as completed"""
-        today = datetime.now().date()
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if task already completed today
-        cursor.execute('''
-            SELECT * FROM daily_tasks 
-            WHERE user_id = ? AND task_type = ? AND completed_date = ?
-        ''', (user_id, task_type, today))
-        
-        if cursor.fetchone():
-            conn.close()
-            return False  # Already completed
-        
-        # Add task completion
-        cursor.execute('''
-            INSERT INTO daily_tasks (user_id, task_type, completed_date, points_earned)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, task_type, today, points))
-        
-        # Update user points and streak
-        cursor.execute('''
-            UPDATE users SET 
-                hustle_points = hustle_points + ?,
-                daily_streak = daily_streak + 1,
-                last_activity = ?
-            WHERE user_id = ?
-        ''', (points, today, user_id))
-        
-        conn.commit()
-        conn.close()
+        today = _today()
+
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            # The unique index on (user_id, task_type, completed_date) makes
+            # the insert a no-op when the task was already completed today, so
+            # the old SELECT-then-INSERT round trip (and its race) goes away.
+            cursor.execute(_SQL_INSERT_TASK, (user_id, task_type, today, points))
+
+            if cursor.rowcount == 0:
+                self._conn.rollback()
+                return False  # Already completed
+
+            # Update user points and streak in the same transaction, so the
+            # insert and the points bump share a single commit/fsync.
+            cursor.execute(_SQL_TASK_REWARD, (points, today, user_id))
+
+            self._conn.commit()
+
+            if user_id not in self.trusted_users:
+                cursor.execute(_SQL_USER_STATS_BRIEF, (user_id,))
+                row = cursor.fetchone()
+                if row and row["hustle_points"] >= TRUSTED_POINTS_THRESHOLD:
+                    self.trusted_users.add(user_id)
+
+        self._leaderboard_cache.clear()
+        self._stats_cache.pop(user_id, None)
         return True
-    
+
     def submit_meme(self, user_id: int, file_id: str, caption: str = None):
         """Submit a meme"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO memes (user_id, file_id, caption)
-            VALUES (?, ?, ?)
-        ''', (user_id, file_id, caption))
-        
-        conn.commit()
-        conn.close()
-        
-        # Award points for meme submission
-        self.add_hustle_points(user_id, 50)
-    
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute(_SQL_INSERT_MEME, (user_id, file_id, caption))
+
+            # Award the submission points in the same transaction as the
+            # insert - one commit instead of two, and the meme can never
+            # exist without its points.
+            cursor.execute(_SQL_MEME_REWARD, (_today(), user_id))
+
+            self._conn.commit()
+
+        self._leaderboard_cache.clear()
+        self._stats_cache.pop(user_id, None)
+
     def log_moderation_action(self, user_id: int, action: str, reason: str, admin_id: int = None):
-        """Log moderation actions"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO moderation_logs (user_id, action, reason, admin_id)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, action, reason, admin_id))
-        
-        conn.commit()
-        conn.close()
-    
+        """Queue a moderation log entry; flushed with the next write batch
+
+        Nothing in the bot reads these back, so they ride along with the
+        points buffer instead of paying a commit of their own.
+        """
+        with self._lock:
+            if not self._modlog_buf:
+                self._modlog_flush_at = time.monotonic() + self._modlog_max_delay
+            self._modlog_buf.append((user_id, action, reason, admin_id))
+
+            if len(self._modlog_buf) >= self._modlog_max_batch or time.monotonic() >= self._modlog_flush_at:
+                self._flush_modlog_locked()
+
     def set_user_verification(self, user_id: int, verified: bool = True):
         """Set user verification status"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_verification (user_id, is_verified, verification_date)
-            VALUES (?, ?, ?)
-        ''', (user_id, verified, datetime.now() if verified else None))
-        
-        conn.commit()
-        conn.close()
-    
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute(_SQL_SET_VERIFIED, (user_id, verified, datetime.now() if verified else None))
+
+            self._conn.commit()
+        self._verified_cache[user_id] = bool(verified)
+
     def is_user_verified(self, user_id: int) -> bool:
-        """Check if user is verified"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT is_verified FROM user_verification WHERE user_id = ?", (user_id,))
-        result = cursor.fetchone()
-        
-        conn.close()
-        return result[0] if result else False
+        """Check if user is verified (cached after the first lookup)"""
+        cached = self._verified_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            cursor = self._conn.cursor()
 
-# Initialize bot instance
-hustle_bot = HustleBot()
+            cursor.execute(_SQL_IS_VERIFIED, (user_id,))
+            result = cursor.fetchone()
+
+        verified = bool(result[0]) if result else False
+        self._verified_cache[user_id] = verified
+        return verified
+
+# Bot instance. Built by post_init in main() once the event loop is up (and
+# mirrored in application.bot_data["hustle"]) instead of at import time, so
+# importing this module no longer pays for database setup.
+hustle_bot = None
 
 async def check_user_permissions(update: Update) -> bool:
     """Check if user is allowed to interact (not banned/muted)"""
@@ -397,12 +732,13 @@ async def moderate_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     user = update.effective_user
     message_text = update.message.text or update.message.caption or ""
     
-    # Skip moderation for admins
-    if hustle_bot.moderation.is_admin(user.id):
+    # Skip moderation for admins and long-standing trusted members
+    if hustle_bot.moderation.is_admin(user.id) or user.id in hustle_bot.trusted_users:
         return True
     
     # Check if user needs verification
-    if not hustle_bot.is_user_verified(user.id) and user.id not in hustle_bot.moderation.verified_users:
+    is_verified = await asyncio.to_thread(hustle_bot.is_user_verified, user.id)
+    if not is_verified and user.id not in hustle_bot.moderation.verified_users:
         await handle_new_user_verification(update, context)
         return False
     
@@ -412,28 +748,40 @@ async def moderate_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         
         if warnings >= 3:
             hustle_bot.moderation.mute_user(user.id)
-            hustle_bot.log_moderation_action(user.id, "MUTED", "Flood spam (3 warnings)", None)
-            await update.message.reply_text(f"🔇 {user.first_name} has been muted for flood spamming!")
-            await notify_admins(f"🚨 User {user.first_name} (@{user.username}) muted for flood spam", context)
+            await asyncio.to_thread(hustle_bot.log_moderation_action, user.id, "MUTED", "Flood spam (3 warnings)", None)
+            await asyncio.gather(
+                update.message.delete(),
+                update.message.reply_text(f"🔇 {user.first_name} has been muted for flood spamming!"),
+                notify_admins(f"🚨 User {user.first_name} (@{user.username}) muted for flood spam", context),
+                return_exceptions=True,
+            )
         else:
-            await update.message.reply_text(f"⚠️ Warning {warnings}/3: Please slow down your messages!")
-        
-        await update.message.delete()
+            await asyncio.gather(
+                update.message.delete(),
+                update.message.reply_text(f"⚠️ Warning {warnings}/3: Please slow down your messages!"),
+                return_exceptions=True,
+            )
         return False
     
     # Check spam keywords
     is_spam, spam_type = hustle_bot.moderation.contains_spam_keywords(message_text)
     if is_spam:
-        await update.message.delete()
-        hustle_bot.log_moderation_action(user.id, "MESSAGE_DELETED", f"Spam keywords: {spam_type}", None)
-        await update.message.reply_text(f"🚫 Message deleted: Contains {spam_type} content")
-        await notify_admins(f"🚨 Deleted {spam_type} message from {user.first_name} (@{user.username})", context)
+        await asyncio.to_thread(hustle_bot.log_moderation_action, user.id, "MESSAGE_DELETED", f"Spam keywords: {spam_type}", None)
+        await asyncio.gather(
+            update.message.delete(),
+            update.message.reply_text(f"🚫 Message deleted: Contains {spam_type} content"),
+            notify_admins(f"🚨 Deleted {spam_type} message from {user.first_name} (@{user.username})", context),
+            return_exceptions=True,
+        )
         return False
     
     # Check suspicious patterns
     if hustle_bot.moderation.is_suspicious_pattern(message_text):
-        await update.message.reply_text("⚠️ Your message contains suspicious patterns. Please contact an admin if this was a mistake.")
-        await notify_admins(f"🔍 Suspicious pattern detected from {user.first_name} (@{user.username}): {message_text[:100]}...", context)
+        await asyncio.gather(
+            update.message.reply_text("⚠️ Your message contains suspicious patterns. Please contact an admin if this was a mistake."),
+            notify_admins(f"🔍 Suspicious pattern detected from {user.first_name} (@{user.username}): {message_text[:100]}...", context),
+            return_exceptions=True,
+        )
     
     return True
 
@@ -465,15 +813,26 @@ Reply with just the number. You have 3 attempts.
     
     await update.message.reply_text(verification_text)
 
-async def notify_admins(message: str, context: ContextTypes.DEFAULT_TYPE):
-    """Notify all admins about moderation events"""
-    global application
-    for admin_id in hustle_bot.moderation.admin_ids:
+# Cap concurrent admin sends so a big admin list can't trip Telegram's
+# global ~30 msg/s limit.
+_notify_sem = asyncio.Semaphore(25)
+
+async def _notify_one_admin(admin_id: int, text: str):
+    """Send one admin alert, bounded by the shared send semaphore"""
+    async with _notify_sem:
         try:
-            await application.bot.send_message(chat_id=admin_id, text=f"🔰 ADMIN ALERT\n\n{message}")
+            await application.bot.send_message(chat_id=admin_id, text=text)
         except Exception as e:
             logger.error(f"Failed to notify admin {admin_id}: {e}")
 
+async def notify_admins(message: str, context: ContextTypes.DEFAULT_TYPE):
+    """Notify all admins about moderation events, fanned out in parallel"""
+    global application
+    text = f"🔰 ADMIN ALERT\n\n{message}"
+    await asyncio.gather(
+        *(_notify_one_admin(admin_id, text) for admin_id in hustle_bot.moderation.admin_ids)
+    )
+
 async def handle_verification_attempt(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle CAPTCHA verification attempts"""
     user = update.effective_user
@@ -482,13 +841,16 @@ async def handle_verification_attempt(update: Update, context: ContextTypes.DEFA
         return
     
     verification_data = hustle_bot.moderation.pending_verification[user.id]
-    user_answer = update.message.text.strip()
+    try:
+        user_answer = int(update.message.text.strip())
+    except ValueError:
+        user_answer = None
     
     if user_answer == verification_data['answer']:
         # Verification successful
         del hustle_bot.moderation.pending_verification[user.id]
         hustle_bot.moderation.verified_users.add(user.id)
-        hustle_bot.set_user_verification(user.id, True)
+        await asyncio.to_thread(hustle_bot.set_user_verification, user.id, True)
         
         await update.message.reply_text("""
 ✅ VERIFICATION SUCCESSFUL!
@@ -507,7 +869,7 @@ Type /start to begin your hustle journey! 💪
             # Too many failed attempts - ban user
             del hustle_bot.moderation.pending_verification[user.id]
             hustle_bot.moderation.ban_user(user.id)
-            hustle_bot.log_moderation_action(user.id, "BANNED", "Failed verification 3 times", None)
+            await asyncio.to_thread(hustle_bot.log_moderation_action, user.id, "BANNED", "Failed verification 3 times", None)
             
             await update.message.reply_text("🚫 Verification failed! You have been banned for security reasons.")
             await notify_admins(f"🚫 User {user.first_name} (@{user.username}) banned for failed verification", context)
@@ -522,68 +884,26 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     user = update.effective_user
-    hustle_bot.get_or_create_user(user.id, user.username, user.first_name)
+    await asyncio.to_thread(hustle_bot.get_or_create_user, user.id, user.username, user.first_name)
     
-    welcome_text = f"""
-🚀 Welcome to HustleBot, {user.first_name}! 
-
-💪 Your journey to success starts here!
-
-🔥 Available Commands:
-/points - Check your hustle points
-/leaderboard - See top hustlers
-/daily - Complete daily tasks
-/submit_meme - Submit a meme for points
-/help - Show all commands
-
-Let's start hustling! 💯
-    """
-    
-    keyboard = [
-        [InlineKeyboardButton("💎 Check Points", callback_data="check_points")],
-        [InlineKeyboardButton("🏆 Leaderboard", callback_data="leaderboard")],
-        [InlineKeyboardButton("📋 Daily Tasks", callback_data="daily_tasks")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await update.message.reply_text(welcome_text, reply_markup=reply_markup)
+    await update.message.reply_text(WELCOME_TEMPLATE.format(name=user.first_name), reply_markup=START_MARKUP)
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Help command"""
-    help_text = """
-🤖 HustleBot Commands:
-
-🎯 Basic Commands:
-/start - Start your hustle journey
-/points - Check your hustle points
-/leaderboard - Top 10 hustlers
-/daily - View daily tasks
-/submit_meme - Submit meme for points
-
-💡 How to earn points:
-• Complete daily tasks (+100 points)
-• Submit memes (+50 points)
-• Maintain daily streaks (bonus points)
-• Engage with the community
-
-🔥 Keep hustling every day to climb the leaderboard!
-    """
-    await update.message.reply_text(help_text)
+    await update.message.reply_text(HELP_TEXT)
 
 async def check_points(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Check user's hustle points"""
     user = update.effective_user
-    hustle_bot.get_or_create_user(user.id, user.username, user.first_name)
-    
-    stats = hustle_bot.get_user_stats(user.id)
+    stats = await asyncio.to_thread(hustle_bot.upsert_and_get_stats, user.id, user.username, user.first_name)
     if stats:
         points_text = f"""
 💎 Your Hustle Stats:
 
-🔥 Hustle Points: {stats[3]}
-⚡ Daily Streak: {stats[4]} days
-📅 Last Activity: {stats[5]}
-🗓️ Joined: {stats[6][:10]}
+🔥 Hustle Points: {stats["hustle_points"]}
+⚡ Daily Streak: {stats["daily_streak"]} days
+📅 Last Activity: {stats["last_activity"]}
+🗓️ Joined: {stats["join_date"]}
 
 Keep grinding! 💪
         """
@@ -594,76 +914,35 @@ Keep grinding! 💪
 
 async def leaderboard(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show leaderboard"""
-    top_users = hustle_bot.get_leaderboard(10)
+    top_users = await asyncio.to_thread(hustle_bot.get_leaderboard, 10)
     
     if not top_users:
         await update.message.reply_text("🏆 No hustlers yet! Be the first!")
         return
     
-    leaderboard_text = "🏆 TOP HUSTLERS LEADERBOARD 🏆\n\n"
-    
     medals = ["🥇", "🥈", "🥉"]
-    
-    for i, user in enumerate(top_users):
-        user_id, username, first_name, points, streak = user
-        medal = medals[i] if i < 3 else f"{i+1}."
-        name = username if username else first_name
-        leaderboard_text += f"{medal} {name}: {points} points (🔥{streak} streak)\n"
-    
-    keyboard = [
-        [InlineKeyboardButton("💎 My Points", callback_data="check_points")],
-        [InlineKeyboardButton("📋 Daily Tasks", callback_data="daily_tasks")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await update.message.reply_text(leaderboard_text, reply_markup=reply_markup)
+
+    # The display name is resolved in SQL, so each row renders directly
+    leaderboard_text = "🏆 TOP HUSTLERS LEADERBOARD 🏆\n\n" + "\n".join(
+        f"{medals[i] if i < 3 else f'{i + 1}.'} {name}: {points} points (🔥{streak} streak)"
+        for i, (name, points, streak) in enumerate(top_users)
+    )
+
+    await update.message.reply_text(leaderboard_text, reply_markup=LEADERBOARD_MARKUP)
 
 async def daily_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show daily tasks"""
     user = update.effective_user
-    hustle_bot.get_or_create_user(user.id, user.username, user.first_name)
+    await asyncio.to_thread(hustle_bot.get_or_create_user, user.id, user.username, user.first_name)
     
-    tasks_text = """
-📋 DAILY HUSTLE TASKS
-
-Complete these tasks to earn points:
-
-🎯 Share Your Goal (+100 points)
-💪 Workout Update (+100 points)  
-📚 Learning Progress (+100 points)
-🧠 Motivational Quote (+50 points)
-💼 Business Update (+150 points)
-
-Click buttons below to complete tasks!
-    """
-    
-    keyboard = [
-        [InlineKeyboardButton("🎯 Goal Shared", callback_data="task_goal")],
-        [InlineKeyboardButton("💪 Workout Done", callback_data="task_workout")],
-        [InlineKeyboardButton("📚 Learning", callback_data="task_learning")],
-        [InlineKeyboardButton("🧠 Quote", callback_data="task_quote")],
-        [InlineKeyboardButton("💼 Business", callback_data="task_business")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await update.message.reply_text(tasks_text, reply_markup=reply_markup)
+    await update.message.reply_text(DAILY_TASKS_TEXT, reply_markup=DAILY_TASKS_MARKUP)
 
 async def submit_meme_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Instructions for submitting memes"""
     if not await check_user_permissions(update):
         return
         
-    meme_text = """
-🎭 MEME SUBMISSION
-
-📸 Send me a photo or GIF to submit a meme!
-✨ Add a caption to make it funnier
-🏆 Earn 50 hustle points per meme
-💎 Best memes get bonus points!
-
-Just send your meme now! 📱
-    """
-    await update.message.reply_text(meme_text)
+    await update.message.reply_text(MEME_INSTRUCTIONS_TEXT)
 
 async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Admin control panel"""
@@ -711,7 +990,7 @@ async def add_admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         new_admin_id = int(context.args[0])
         hustle_bot.moderation.add_admin(new_admin_id)
         await update.message.reply_text(f"✅ User {new_admin_id} added as admin!")
-        hustle_bot.log_moderation_action(new_admin_id, "ADMIN_ADDED", "Added by admin", user.id)
+        await asyncio.to_thread(hustle_bot.log_moderation_action, new_admin_id, "ADMIN_ADDED", "Added by admin", user.id)
     except ValueError:
         await update.message.reply_text("❌ Invalid user ID!")
 
@@ -730,7 +1009,7 @@ async def mute_user_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         target_user_id = int(context.args[0])
         hustle_bot.moderation.mute_user(target_user_id)
-        hustle_bot.log_moderation_action(target_user_id, "MUTED", "Muted by admin", user.id)
+        await asyncio.to_thread(hustle_bot.log_moderation_action, target_user_id, "MUTED", "Muted by admin", user.id)
         await update.message.reply_text(f"🔇 User {target_user_id} has been muted!")
         await notify_admins(f"🔇 User {target_user_id} muted by admin {user.first_name}", context)
     except ValueError:
@@ -751,7 +1030,7 @@ async def ban_user_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         target_user_id = int(context.args[0])
         hustle_bot.moderation.ban_user(target_user_id)
-        hustle_bot.log_moderation_action(target_user_id, "BANNED", "Banned by admin", user.id)
+        await asyncio.to_thread(hustle_bot.log_moderation_action, target_user_id, "BANNED", "Banned by admin", user.id)
         await update.message.reply_text(f"🚫 User {target_user_id} has been banned!")
         await notify_admins(f"🚫 User {target_user_id} banned by admin {user.first_name}", context)
     except ValueError:
@@ -776,7 +1055,7 @@ async def mod_stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 🔰 Total Admins: {len(hustle_bot.moderation.admin_ids)}
 
 💬 Message Tracking: {len(hustle_bot.moderation.user_messages)} users
-⚡ Command Tracking: {len(hustle_bot.moderation.user_commands)} users
+⚡ Command Tracking: {len(hustle_bot.moderation.command_buckets)} users
     """
     
     await update.message.reply_text(stats_text)
@@ -796,7 +1075,7 @@ async def unmute_user_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     try:
         target_user_id = int(context.args[0])
         hustle_bot.moderation.unmute_user(target_user_id)
-        hustle_bot.log_moderation_action(target_user_id, "UNMUTED", "Unmuted by admin", user.id)
+        await asyncio.to_thread(hustle_bot.log_moderation_action, target_user_id, "UNMUTED", "Unmuted by admin", user.id)
         await update.message.reply_text(f"🔊 User {target_user_id} has been unmuted!")
     except ValueError:
         await update.message.reply_text("❌ Invalid user ID!")
@@ -816,11 +1095,18 @@ async def unban_user_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     try:
         target_user_id = int(context.args[0])
         hustle_bot.moderation.banned_users.discard(target_user_id)
-        hustle_bot.log_moderation_action(target_user_id, "UNBANNED", "Unbanned by admin", user.id)
+        await asyncio.to_thread(hustle_bot.log_moderation_action, target_user_id, "UNBANNED", "Unbanned by admin", user.id)
         await update.message.reply_text(f"✅ User {target_user_id} has been unbanned!")
     except ValueError:
         await update.message.reply_text("❌ Invalid user ID!")
 
+def rate_limit(handler):
+    """Wrap a command handler so it only runs when the user is under the limit"""
+    async def wrapper(update, context):
+        if await handle_command_rate_limit(update, context):
+            await handler(update, context)
+    return wrapper
+
 async def handle_command_rate_limit(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
     """Check command rate limiting"""
     user_id = update.effective_user.id
@@ -854,34 +1140,105 @@ async def handle_meme_submission(update: Update, context: ContextTypes.DEFAULT_T
     if not await check_user_permissions(update):
         return
         
+    # moderate_message also gates verification and flood accounting, so it
+    # always runs; with no caption the content scans are length-gated no-ops
     if not await moderate_message(update, context):
         return
         
     user = update.effective_user
-    hustle_bot.get_or_create_user(user.id, user.username, user.first_name)
+    await asyncio.to_thread(hustle_bot.get_or_create_user, user.id, user.username, user.first_name)
     
     if update.message.photo:
         file_id = update.message.photo[-1].file_id
-        caption = update.message.caption or ""
-        
-        hustle_bot.submit_meme(user.id, file_id, caption)
-        
-        success_text = """
-🎉 MEME SUBMITTED!
+    elif update.message.animation:
+        file_id = update.message.animation.file_id
+    else:
+        return
+    caption = update.message.caption or ""
+    
+    await asyncio.to_thread(hustle_bot.submit_meme, user.id, file_id, caption)
+    
+    await update.message.reply_text(MEME_SUCCESS_TEXT, reply_markup=MEME_SUCCESS_MARKUP)
 
-+50 Hustle Points earned! 💎
-Your meme has been added to the collection!
+# In-flight reads keyed by request, so a double-tapped button awaits the
+# one query already running instead of issuing its own.
+_inflight = {}
 
-Keep the memes coming! 🔥
-        """
-        
-        keyboard = [
-            [InlineKeyboardButton("💎 Check Points", callback_data="check_points")],
-            [InlineKeyboardButton("🏆 Leaderboard", callback_data="leaderboard")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(success_text, reply_markup=reply_markup)
+async def _single_flight(key, fn, *args):
+    """Coalesce concurrent identical reads into a single DB call"""
+    fut = _inflight.get(key)
+    if fut is not None:
+        return await fut
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await asyncio.to_thread(fn, *args)
+        fut.set_result(result)
+        return result
+    finally:
+        del _inflight[key]
+        # On error or cancellation wake any waiters instead of leaving
+        # them hanging; cancelling (rather than set_exception) also avoids
+        # an unretrieved-exception warning when nobody is waiting.
+        if not fut.done():
+            fut.cancel()
+
+async def _edit_if_changed(query, context, text, **kwargs):
+    """Edit the callback message, skipping the API call when nothing changed
+
+    Telegram rejects identical edits with 'Message is not modified', so a
+    repeated tap would otherwise cost a round-trip just to raise. One
+    (message_id, text) entry per user - enough to dedupe repeat taps on
+    the same message without accumulating an entry per edited message -
+    recorded only after the edit succeeds so a failed edit can be retried.
+    """
+    if context.user_data.get("last_cb_edit") == (query.message.message_id, text):
+        return
+    await query.edit_message_text(text, **kwargs)
+    context.user_data["last_cb_edit"] = (query.message.message_id, text)
+
+async def _cb_check_points(query, user, context):
+    """Render the points summary for the check_points button"""
+    stats = await _single_flight(f"pts:{user.id}", hustle_bot.get_user_stats_brief, user.id)
+    if stats:
+        points_text = f"💎 Hustle Points: {stats['hustle_points']}\n⚡ Daily Streak: {stats['daily_streak']} days"
+    else:
+        points_text = "❌ Error fetching stats"
+    await _edit_if_changed(query, context, points_text)
+
+async def _cb_leaderboard(query, user, context):
+    """Render the top-5 leaderboard button"""
+    top_users = await _single_flight("lb:5", hustle_bot.get_leaderboard, 5)
+    leaderboard_text = "🏆 TOP 5 HUSTLERS:\n\n" + "\n".join(
+        f"{i + 1}. {name}: {points} points"
+        for i, (name, points, streak) in enumerate(top_users)
+    )
+
+    await _edit_if_changed(query, context, leaderboard_text)
+
+async def _cb_daily_tasks(query, user, context):
+    """Show the compact daily-task keyboard"""
+    tasks_text = "📋 Click task buttons to complete them!"
+    await _edit_if_changed(query, context, tasks_text, reply_markup=MINI_DAILY_MARKUP)
+
+async def _cb_task(query, user, context):
+    """Complete one daily task from a task_* button"""
+    task_type = query.data[5:]  # strip the "task_" prefix
+    pts = TASK_POINTS.get(task_type, 50)
+
+    if await asyncio.to_thread(hustle_bot.complete_daily_task, user.id, task_type, pts):
+        success_text = f"✅ Task completed! +{pts} points earned!"
+    else:
+        success_text = "⚠️ You already completed this task today!"
+    
+    await _edit_if_changed(query, context, success_text)
+
+# Dispatch table: exact callback_data keys plus the task_ prefix family.
+CALLBACK_HANDLERS = {
+    "check_points": _cb_check_points,
+    "leaderboard": _cb_leaderboard,
+    "daily_tasks": _cb_daily_tasks,
+}
 
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle button callbacks"""
@@ -889,46 +1246,13 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     user = query.from_user
-    hustle_bot.get_or_create_user(user.id, user.username, user.first_name)
+    await asyncio.to_thread(hustle_bot.get_or_create_user, user.id, user.username, user.first_name)
     
-    if query.data == "check_points":
-        stats = hustle_bot.get_user_stats(user.id)
-        if stats:
-            points_text = f"💎 Hustle Points: {stats[3]}\n⚡ Daily Streak: {stats[4]} days"
-        else:
-            points_text = "❌ Error fetching stats"
-        await query.edit_message_text(points_text)
-        
-    elif query.data == "leaderboard":
-        top_users = hustle_bot.get_leaderboard(5)
-        leaderboard_text = "🏆 TOP 5 HUSTLERS:\n\n"
-        
-        for i, user_data in enumerate(top_users):
-            name = user_data[1] if user_data[1] else user_data[2]
-            leaderboard_text += f"{i+1}. {name}: {user_data[3]} points\n"
-        
-        await query.edit_message_text(leaderboard_text)
-        
-    elif query.data == "daily_tasks":
-        tasks_text = "📋 Click task buttons to complete them!"
-        keyboard = [
-            [InlineKeyboardButton("🎯 Goal (+100)", callback_data="task_goal")],
-            [InlineKeyboardButton("💪 Workout (+100)", callback_data="task_workout")],
-            [InlineKeyboardButton("📚 Learning (+100)", callback_data="task_learning")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await query.edit_message_text(tasks_text, reply_markup=reply_markup)
-        
-    elif query.data.startswith("task_"):
-        task_type = query.data.replace("task_", "")
-        task_points = {"goal": 100, "workout": 100, "learning": 100, "quote": 50, "business": 150}
-        
-        if hustle_bot.complete_daily_task(user.id, task_type, task_points.get(task_type, 50)):
-            success_text = f"✅ Task completed! +{task_points.get(task_type, 50)} points earned!"
-        else:
-            success_text = "⚠️ You already completed this task today!"
-        
-        await query.edit_message_text(success_text)
+    handler = CALLBACK_HANDLERS.get(query.data)
+    if handler is None and query.data.startswith("task_"):
+        handler = _cb_task
+    if handler is not None:
+        await handler(query, user, context)
 
 def main():
     """Start the bot"""
@@ -941,41 +1265,46 @@ def main():
         print("💡 Add your bot token to environment variables")
         return
     
-    # Create application
-    application = Application.builder().token(token).build()
-    
-    # Add command handlers with rate limiting
-    async def rate_limited_start(update, context):
-        if await handle_command_rate_limit(update, context):
-            await start(update, context)
-    
-    async def rate_limited_help(update, context):
-        if await handle_command_rate_limit(update, context):
-            await help_command(update, context)
-    
-    async def rate_limited_points(update, context):
-        if await handle_command_rate_limit(update, context):
-            await check_points(update, context)
-    
-    async def rate_limited_leaderboard(update, context):
-        if await handle_command_rate_limit(update, context):
-            await leaderboard(update, context)
-    
-    async def rate_limited_daily(update, context):
-        if await handle_command_rate_limit(update, context):
-            await daily_tasks(update, context)
-    
-    async def rate_limited_submit_meme(update, context):
-        if await handle_command_rate_limit(update, context):
-            await submit_meme_command(update, context)
-    
-    # Basic commands
-    application.add_handler(CommandHandler("start", rate_limited_start))
-    application.add_handler(CommandHandler("help", rate_limited_help))
-    application.add_handler(CommandHandler("points", rate_limited_points))
-    application.add_handler(CommandHandler("leaderboard", rate_limited_leaderboard))
-    application.add_handler(CommandHandler("daily", rate_limited_daily))
-    application.add_handler(CommandHandler("submit_meme", rate_limited_submit_meme))
+    # One tuned HTTPX pool per transport: outbound API calls keep warm
+    # TLS connections instead of re-handshaking under load, and a second
+    # instance isolates long-poll get_updates traffic from replies.
+    # (HTTP/2 needs the httpx[http2] extra, which isn't a dependency here.)
+    request = HTTPXRequest(connection_pool_size=64, pool_timeout=5.0)
+    get_updates_request = HTTPXRequest(connection_pool_size=8, pool_timeout=5.0)
+
+    async def post_init(app):
+        # Defer database setup until the application actually starts, and
+        # run it in a worker thread so the fresh event loop stays free.
+        global hustle_bot
+        hustle_bot = await asyncio.to_thread(HustleBot)
+        app.bot_data["hustle"] = hustle_bot
+
+    async def post_shutdown(app):
+        hb = app.bot_data.pop("hustle", None)
+        if hb is not None:
+            await asyncio.to_thread(hb.close)
+
+    # Create application. Process up to 32 updates concurrently - the DB
+    # layer is thread-safe behind its lock and handlers hop to worker
+    # threads for SQLite, so handlers can interleave during commits.
+    application = (
+        Application.builder()
+        .token(token)
+        .request(request)
+        .get_updates_request(get_updates_request)
+        .concurrent_updates(32)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
+    
+    # Basic commands, each wrapped with rate limiting
+    application.add_handler(CommandHandler("start", rate_limit(start)))
+    application.add_handler(CommandHandler("help", rate_limit(help_command)))
+    application.add_handler(CommandHandler("points", rate_limit(check_points)))
+    application.add_handler(CommandHandler("leaderboard", rate_limit(leaderboard)))
+    application.add_handler(CommandHandler("daily", rate_limit(daily_tasks)))
+    application.add_handler(CommandHandler("submit_meme", rate_limit(submit_meme_command)))
     
     # Admin commands
     application.add_handler(CommandHandler("admin", admin_panel))
@@ -987,29 +1316,48 @@ def main():
     application.add_handler(CommandHandler("mod_stats", mod_stats_command))
     
     # Message handlers
-    application.add_handler(MessageHandler(filters.PHOTO, handle_meme_submission))
+    application.add_handler(MessageHandler(filters.PHOTO | filters.ANIMATION, handle_meme_submission))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message_moderation))
     
     # Handle button callbacks
     application.add_handler(CallbackQueryHandler(button_callback))
     
-    # Check if running on Railway or other platforms (webhook mode)
+    # Webhook mode is preferred: push delivery instead of constant
+    # long-poll round-trips. WEBHOOK_URL is the first-class setting; the
+    # platform-provided URLs remain as fallbacks.
     port = int(os.getenv('PORT', 5000))
-    webhook_url = os.getenv('RAILWAY_STATIC_URL') or os.getenv('RENDER_EXTERNAL_URL')
+    webhook_url = (os.getenv('WEBHOOK_URL')
+                   or os.getenv('RAILWAY_STATIC_URL')
+                   or os.getenv('RENDER_EXTERNAL_URL'))
+    
+    if not webhook_url and os.getenv('ENV', '').lower() == 'production':
+        print("❌ Production requires webhook mode - please set WEBHOOK_URL")
+        print("💡 Polling is only intended for local development")
+        return
     
     if webhook_url:
         # Webhook mode for deployment platforms
         print(f"🚀 HustleBot starting in webhook mode on port {port}")
+        # Random per-process secret, doubled into the URL path so junk
+        # deliveries are rejected before they reach the JSON parser.
+        # Set WEBHOOK_SECRET_TOKEN to keep it stable across restarts.
+        secret = os.getenv('WEBHOOK_SECRET_TOKEN') or secrets.token_urlsafe(24)
         application.run_webhook(
             listen="0.0.0.0",
             port=port,
-            webhook_url=f"{webhook_url}/webhook",
-            secret_token=token[:32]  # Use part of bot token as secret
+            url_path=secret,
+            webhook_url=f"{webhook_url}/{secret}",
+            secret_token=secret
         )
     else:
-        # Polling mode for local development
+        # Polling mode for local development. Long 50s polls instead of
+        # the default short ones, and only the update types this bot
+        # actually handles - messages and button presses.
         print("🚀 HustleBot starting in polling mode...")
-        application.run_polling(allowed_updates=Update.ALL_TYPES)
+        application.run_polling(
+            timeout=50,
+            allowed_updates=["message", "callback_query"],
+        )
 
 if __name__ == '__main__':
     main()